@@ -4,14 +4,45 @@ import json
 import shutil
 import zipfile
 import logging
+import time
+import tempfile
+import urllib3
 import requests
+import threading
 import urllib.parse
+from tqdm import tqdm
+from functools import lru_cache
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 
 PARENT_DIRECTORY = None
 CLIENT_ID = None
 CLIENT_SECRET = None
+# Refresh the token this many seconds before it expires to avoid mid-request expiry
+TOKEN_REFRESH_MARGIN = 300
+MAX_DOWNLOAD_WORKERS = 8
+# Each dataset in flight is staged in full under the temp dir, so keep this small
+MAX_DATASET_WORKERS = 2
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+VERSION_CACHE_FILE = ".version_cache.json"
+VERSION_CACHE_LOCK = threading.Lock()
+# Already-compressed formats gain almost nothing from DEFLATE, so store them as-is
+NO_COMPRESS_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.mp4', '.mov', '.gz', '.zip', '.bz2', '.xz', '.7z', '.webp'}
+
+# Share one pooled session to reuse keep-alive connections, retrying transient server errors with
+# exponential backoff instead of failing the whole batch. The adapter covers every https host, since
+# /download may redirect to a storage host that carries the bulk of the traffic
+RETRY_POLICY = Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504], allowed_methods=["GET", "POST", "HEAD"])
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=MAX_DOWNLOAD_WORKERS + MAX_DATASET_WORKERS, max_retries=RETRY_POLICY))
 
 def initiate_logging():
     logging.basicConfig(
@@ -21,37 +52,59 @@ def initiate_logging():
         filemode='a'
     )
 
-def get_dryad_token() -> str:
+def parse_json_response(response: requests.Response) -> dict:
+    """
+    Parses a JSON response body, using orjson when it is installed
+
+    Args:
+        response: The response returned by the Dryad API
+
+    Returns:
+        The decoded JSON body
+
+    Raises:
+        requests.exceptions.JSONDecodeError: If the body is not valid JSON, matching response.json()
+    """
+    if orjson:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos, response=response) from e
+    return response.json()
+
+def get_dryad_token(client_id: str, client_secret: str) -> tuple[str, float] | None:
     """
     Sends a POST request with Dryad Client ID and Dryad Client Secret to get the token
 
     Args:
-        CLIENT_ID: Dryad Client ID
-        CLIENT_SECRET: Dryad Client Secret
+        client_id: Dryad Client ID
+        client_secret: Dryad Client Secret
 
     Returns:
-        A Bearer token that is expired in 10 hours
+        A Bearer token that is expired in 10 hours and its expiry timestamp
     """
-    if not CLIENT_ID or CLIENT_ID == "" or not CLIENT_SECRET or CLIENT_SECRET == "":
+    if not client_id or client_id == "" or not client_secret or client_secret == "":
         print("Error: CLIENT_ID and CLIENT_SECRET not found in .env file")
         logging.error("CLIENT_ID and CLIENT_SECRET not found in .env file")
         return
-    # If the token is cached
-    cached_token = load_cached_token()
-    if cached_token:
-        return cached_token
-    AUTH_URL = f"https://datadryad.org/oauth/token?client_id={CLIENT_ID}&client_secret={CLIENT_SECRET}&grant_type=client_credentials"
+    AUTH_URL = f"https://datadryad.org/oauth/token?client_id={client_id}&client_secret={client_secret}&grant_type=client_credentials"
     headers = {
         "content-type": "application/x-www-form-urlencoded",
         "charset": "UTF-8"
     }
-    response = requests.request("POST", AUTH_URL, data="", headers=headers)
+    try:
+        response = SESSION.post(AUTH_URL, data="", headers=headers)
+    except requests.exceptions.RequestException as e:
+        # Raised once the retry policy gives up on the token endpoint
+        print(f"An error occurred: {e}")
+        logging.error(f"An error occurred: {e}")
+        return None
     if response.status_code == 200:
         data = response.json()
         token = data["access_token"]
-        cache_token(token)
+        expiry_time = cache_token(token)
         logging.info("Successfully get token")
-        return token
+        return token, expiry_time
     else:
         print(f"Request failed with status code: {response.status_code}")
         print(f"Response text: {response.text}")
@@ -59,6 +112,41 @@ def get_dryad_token() -> str:
         logging.error(f"Response text: {response.text}")
         return None
 
+class TokenManager:
+    """
+    Keeps the Bearer token in memory and refreshes it shortly before it expires,
+    so concurrent downloads share one token instead of each reloading the cache
+
+    Args:
+        client_id: Dryad Client ID
+        client_secret: Dryad Client Secret
+    """
+    def __init__(self, client_id: str, client_secret: str):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self._token = None
+        self._expiry = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> str | None:
+        """
+        Returns a valid Bearer token, loading it from the cache or requesting a new one when needed
+
+        Returns:
+            The Bearer token, or None if it cannot be obtained
+        """
+        with self._lock:
+            if self._token and time.time() < self._expiry - TOKEN_REFRESH_MARGIN:
+                return self._token
+            # If the token is cached
+            token_data = load_cached_token()
+            if not token_data or time.time() >= token_data[1] - TOKEN_REFRESH_MARGIN:
+                token_data = get_dryad_token(self.client_id, self.client_secret)
+            if not token_data:
+                return None
+            self._token, self._expiry = token_data
+            return self._token
+
 def zip_folder(source_path: str, destination_path: str, remove_source: bool = True, zip_name: str = "dataset.zip"):
     """
     Zips the contents of a folder into a specified zip file.
@@ -70,40 +158,60 @@ def zip_folder(source_path: str, destination_path: str, remove_source: bool = Tr
         zip_name: The name of the output zip file (Optional)
     """
     zip_file_path = os.path.join(destination_path, zip_name)
-    with zipfile.ZipFile(zip_file_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(source_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, source_path)
-                zipf.write(file_path, arcname)
-        logging.info(f"Zip up the folder and create {zip_name}")
+    # Build into a side file so an existing zip survives until the new one is complete
+    partial_zip_path = zip_file_path + ".tmp"
+    # Slice archive names off a precomputed prefix instead of calling relpath per file
+    source_root = os.path.abspath(source_path)
+    prefix_length = len(source_root) + 1
+    try:
+        with zipfile.ZipFile(partial_zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+            for root, dirs, files in os.walk(source_root):
+                for file in files:
+                    file_path = os.path.join(root, file)
+                    arcname = file_path[prefix_length:]
+                    extension = os.path.splitext(file)[1].lower()
+                    compress_type = zipfile.ZIP_STORED if extension in NO_COMPRESS_EXTENSIONS else zipfile.ZIP_DEFLATED
+                    zipf.write(file_path, arcname, compress_type=compress_type)
+                    # Free the staged copy right away so the dataset is never held twice on disk
+                    if(remove_source):
+                        os.remove(file_path)
+    except BaseException:
+        if os.path.exists(partial_zip_path):
+            os.remove(partial_zip_path)
+        raise
+    os.replace(partial_zip_path, zip_file_path)
+    logging.info(f"Zip up the folder and create {zip_name}")
     if(remove_source):
         shutil.rmtree(source_path)
         logging.info(f"Zip up the folder and create {zip_name}")
 
-def cache_token(token: str, expired_hours: int = 10):
+def cache_token(token: str, expired_hours: int = 10) -> float:
     """
     Saves the Bearer token to the cache
 
     Args:
         token: The Bearer Token
         expired_hours: Hours until token expires 
+
+    Returns:
+        The expiry timestamp of the token
     """
     cache_file_path = ".token_cache.json"
-    expiry_time = (datetime.now() + timedelta(minutes=expired_hours * 60 - 1)).isoformat()
+    expiry_time = (datetime.now() + timedelta(minutes=expired_hours * 60 - 1)).timestamp()
     cache_data = {
         "token": token,
         "expiry": expiry_time
     }
     with open(cache_file_path, 'w') as f:
         json.dump(cache_data, f)
+    return expiry_time
 
-def load_cached_token() -> str | None:
+def load_cached_token() -> tuple[str, float] | None:
     """
     Loads the token from cache if it's still valid.
     
     Returns:
-        Cached token if valid, None otherwise
+        Cached token and its expiry timestamp if valid, None otherwise
     """
     cache_file = ".token_cache.json"
     if not os.path.exists(cache_file):
@@ -113,20 +221,78 @@ def load_cached_token() -> str | None:
         with open(cache_file, 'r') as f:
             cache_data = json.load(f)
         
-        expiry_time = datetime.fromisoformat(cache_data["expiry"])
+        expiry_time = float(cache_data["expiry"])
         # If the cache has not been expired yet
-        if datetime.now() < expiry_time:
+        if time.time() < expiry_time:
             print("CACHE HIT")
             logging.info("CACHE HIT")
-            return cache_data["token"]
+            return cache_data["token"], expiry_time
         else:
             print("CACHE MISS")
             logging.info("CACHE MISS")
             os.remove(cache_file)
             return None
-    except (json.JSONDecodeError, KeyError, ValueError):
+    except (json.JSONDecodeError, KeyError, ValueError, TypeError):
         return None
     
+def cache_version(doi_identifier: str, version_url: str, expired_minutes: int = 60):
+    """
+    Saves the latest version URL of a dataset to the cache
+
+    Args:
+        doi_identifier: the DOI identifier of the Dryad Dataset (doi:10561/dryad.<doi_identifier>)
+        version_url: The URL of the latest version
+        expired_minutes: Minutes until the cached version expires
+    """
+    expiry_time = (datetime.now() + timedelta(minutes=expired_minutes)).timestamp()
+    # Datasets may be fetched from several threads, so serialize the read-modify-write
+    with VERSION_CACHE_LOCK:
+        cache_data = {}
+        if os.path.exists(VERSION_CACHE_FILE):
+            try:
+                with open(VERSION_CACHE_FILE, 'r') as f:
+                    cache_data = json.load(f)
+            except json.JSONDecodeError:
+                cache_data = {}
+        cache_data[doi_identifier] = {
+            "url": version_url,
+            "expiry": expiry_time
+        }
+        with open(VERSION_CACHE_FILE, 'w') as f:
+            json.dump(cache_data, f)
+
+def load_cached_version(doi_identifier: str) -> str | None:
+    """
+    Loads the latest version URL of a dataset from cache if it's still valid.
+
+    Args:
+        doi_identifier: the DOI identifier of the Dryad Dataset (doi:10561/dryad.<doi_identifier>)
+
+    Returns:
+        Cached version URL if valid, None otherwise
+    """
+    if not os.path.exists(VERSION_CACHE_FILE):
+        return None
+
+    try:
+        with VERSION_CACHE_LOCK:
+            with open(VERSION_CACHE_FILE, 'r') as f:
+                cache_data = json.load(f)
+
+        entry = cache_data.get(doi_identifier)
+        if not entry:
+            return None
+        expiry_time = float(entry["expiry"])
+        # If the cache has not been expired yet
+        if time.time() < expiry_time:
+            logging.info(f"VERSION CACHE HIT: {doi_identifier}")
+            return entry["url"]
+        logging.info(f"VERSION CACHE MISS: {doi_identifier}")
+        return None
+    except (json.JSONDecodeError, KeyError, ValueError, TypeError, AttributeError):
+        return None
+
+@lru_cache(maxsize=256)
 def encode_dryad_doi_url(doi_identifier: str, postfix: str = "") -> str:
     """
     Encodes the specific Dryad identifier part of a DOI to create an encoded URL.
@@ -169,30 +335,105 @@ def create_new_dir(doi_identifier: str, postfix: str = None) -> str | None:
         logging.error(f"Error creating directory: {e}")
         return None
 
-def get_dryad_dataset_version(doi_identifier: str, token: str) -> str | None:
+def load_archived_sizes(zip_file_path: str) -> dict[str, int]:
+    """
+    Lists the files already stored in a previously downloaded dataset zip
+
+    Args:
+        zip_file_path: The path to the existing dataset zip
+
+    Returns:
+        A mapping of archived file names to their uncompressed sizes, empty if there is no usable zip
+    """
+    if not os.path.exists(zip_file_path):
+        return {}
+    try:
+        with zipfile.ZipFile(zip_file_path, 'r') as zipf:
+            return {info.filename: info.file_size for info in zipf.infolist()}
+    except (zipfile.BadZipFile, OSError) as e:
+        logging.error(f"Cannot read existing zip {zip_file_path}: {e}")
+        return {}
+
+def is_dataset_archived(archived_sizes: dict[str, int], file_list: list[dict]) -> bool:
+    """
+    Checks whether an existing dataset zip already holds exactly the files of the latest version
+
+    Args:
+        archived_sizes: The archived file sizes returned by load_archived_sizes
+        file_list: The file entries returned by the Dryad files endpoint
+
+    Returns:
+        True if every file is archived with the expected size, False otherwise
+    """
+    if not archived_sizes or len(archived_sizes) != len(file_list):
+        return False
+    return all(file.get("size") is not None and archived_sizes.get(file["path"]) == int(file["size"]) for file in file_list)
+
+def extract_archived_files(zip_file_path: str, archived_sizes: dict[str, int], file_list: list[dict], destination_path: str) -> list[dict]:
+    """
+    Restores files whose size matches the Dryad listing from an existing dataset zip, so a re-run only fetches what is missing
+
+    Args:
+        zip_file_path: The path to the existing dataset zip
+        archived_sizes: The archived file sizes returned by load_archived_sizes
+        file_list: The file entries returned by the Dryad files endpoint
+        destination_path: The staging directory to extract into
+
+    Returns:
+        The file entries that still need to be downloaded
+    """
+    if not archived_sizes:
+        return file_list
+    pending_files = []
+    with zipfile.ZipFile(zip_file_path, 'r') as zipf:
+        for file in file_list:
+            if file.get("size") is None or archived_sizes.get(file["path"]) != int(file["size"]):
+                pending_files.append(file)
+                continue
+            try:
+                zipf.extract(file["path"], destination_path)
+            except (zipfile.BadZipFile, OSError) as e:
+                logging.error(f"Cannot reuse {file['path']} from {zip_file_path}: {e}")
+                pending_files.append(file)
+    skipped = len(file_list) - len(pending_files)
+    if skipped:
+        print(f"Reusing {skipped} file(s) from {zip_file_path}")
+        logging.info(f"Reusing {skipped} file(s) from {zip_file_path}")
+    return pending_files
+
+def get_dryad_dataset_version(doi_identifier: str, token_manager: TokenManager) -> str | None:
     """
     Helper function: Gets the newest version of the dataset
 
     Args:
         doi_identifier: the DOI identifier of the Dryad Dataset (doi:10561/dryad.<doi_identifier>)
-        token: The Bearer token for authentication 
+        token_manager: Provides the Bearer token for authentication 
 
     Returns:
         The newest version of the dataset      
     """
+    cached_version = load_cached_version(doi_identifier)
+    if cached_version:
+        return cached_version
+    token = token_manager.get()
+    if not token:
+        print("Error: no valid authentication token")
+        logging.error("No valid authentication token")
+        return None
     API_URL = encode_dryad_doi_url(doi_identifier, "/versions")
     headers = {
         "Authorization": f"Bearer {token}"
     }
     response = None
     try:
-        response = requests.get(API_URL, headers=headers)
+        response = SESSION.get(API_URL, headers=headers)
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json_response(response)
             versions_count = int(data["count"])
             latest_versions_url = data["_embedded"]["stash:versions"][versions_count - 1]["_links"]["self"]["href"]
             if not latest_versions_url:
                 return None
+            cache_version(doi_identifier, latest_versions_url)
             return latest_versions_url
     except requests.exceptions.RequestException as e:
         print(f"An error occurred: {e}")
@@ -202,34 +443,87 @@ def get_dryad_dataset_version(doi_identifier: str, token: str) -> str | None:
             logging.error(f"Status code: {response.status_code}")
             logging.error(f"Response content: {response.text}")
 
-def get_dryad_dataset(doi_identifier: str, token: str):
+def get_dryad_dataset(doi_identifier: str, token_manager: TokenManager, download_executor: ThreadPoolExecutor | None = None):
     """
     Downloads Dryad dataset
 
     Args:
         doi_identifier: the DOI identifier of the Dryad Dataset (doi:10561/dryad.<doi_identifier>)
-        token: The Bearer token for authentication    
+        token_manager: Provides the Bearer token for authentication    
+        download_executor: Pool shared across datasets for file downloads, a private one is used if omitted (Optional)
     """
-    version = get_dryad_dataset_version(doi_identifier, token)
+    print(f"\nDownloading dataset for DOI: {doi_identifier}")
+    logging.info(f"Downloading dataset for DOI: {doi_identifier}")
+    version = get_dryad_dataset_version(doi_identifier, token_manager)
+    if not version:
+        print(f"Error: no version found for DOI: {doi_identifier}")
+        logging.error(f"No version found for DOI: {doi_identifier}")
+        return
+    token = token_manager.get()
+    if not token:
+        print("Error: no valid authentication token")
+        logging.error("No valid authentication token")
+        return
     API_URL = f"https://datadryad.org{version}/files"
     headers = {
         "Authorization": f"Bearer {token}"
     }
     response = None
     try:
-        response = requests.get(API_URL, headers=headers)
+        response = SESSION.get(API_URL, headers=headers)
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json_response(response)
             file_list = data["_embedded"]["stash:files"]
-            dataset_directory = create_new_dir(doi_identifier, "data")
-            if not dataset_directory:
+            final_directory = create_new_dir(doi_identifier)
+            if not final_directory:
                 print(f"Directory does not exist")
                 logging.error(f"Directory does not exist")
                 return
-            for file in file_list:
-                get_dryad_dataset_file(file["_links"]["self"]["href"], os.path.join(dataset_directory, file["path"]), token)
-            final_directory = create_new_dir(doi_identifier)
-            zip_folder(dataset_directory, final_directory) 
+            zip_file_path = os.path.join(final_directory, "dataset.zip")
+            # Files that finished during an earlier failed run, kept so a retry only fetches the rest
+            resume_zip_path = zip_file_path + ".part"
+            archived_sizes = load_archived_sizes(zip_file_path)
+            if is_dataset_archived(archived_sizes, file_list):
+                print(f"Dataset already downloaded: {zip_file_path}")
+                logging.info(f"Dataset already downloaded: {zip_file_path}")
+                return
+            # Stage the downloads under the system temp dir so only the final zip lands in PARENT_DIRECTORY
+            with tempfile.TemporaryDirectory() as dataset_directory:
+                pending_files = extract_archived_files(zip_file_path, archived_sizes, file_list, dataset_directory)
+                pending_files = extract_archived_files(resume_zip_path, load_archived_sizes(resume_zip_path), pending_files, dataset_directory)
+                # Downloads are I/O bound, so overlap them on a bounded pool sharing SESSION
+                failed_files = []
+                executor_context = nullcontext(download_executor) if download_executor else ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS)
+                with executor_context as executor:
+                    futures = {
+                        executor.submit(get_dryad_dataset_file, file["_links"]["self"]["href"], os.path.join(dataset_directory, file["path"]), token_manager): file["path"]
+                        for file in pending_files
+                    }
+                    for future in as_completed(futures):
+                        try:
+                            if not future.result():
+                                failed_files.append(futures[future])
+                        except Exception as e:
+                            print(f"Error downloading {futures[future]}: {e}")
+                            logging.error(f"Error downloading {futures[future]}: {e}")
+                            failed_files.append(futures[future])
+                # Never archive an incomplete dataset as if it were complete
+                if failed_files:
+                    print(f"{len(failed_files)} file(s) failed to download for {doi_identifier}, dataset.zip not written")
+                    logging.error(f"{len(failed_files)} file(s) failed to download for {doi_identifier}, dataset.zip not written: {failed_files}")
+                    # Keep the finished files in the resume archive; drop whatever the failed downloads left behind
+                    for failed_path in failed_files:
+                        staged_path = os.path.join(dataset_directory, failed_path)
+                        if os.path.exists(staged_path):
+                            os.remove(staged_path)
+                    if len(failed_files) < len(file_list):
+                        zip_folder(dataset_directory, final_directory, zip_name=os.path.basename(resume_zip_path))
+                        print(f"Saved finished files to {resume_zip_path} for the next run")
+                        logging.info(f"Saved finished files to {resume_zip_path} for the next run")
+                    return
+                zip_folder(dataset_directory, final_directory)
+                if os.path.exists(resume_zip_path):
+                    os.remove(resume_zip_path)
     except requests.exceptions.RequestException as e:
         logging.error(f"An error occurred: {e}")
         print(f"An error occurred: {e}")
@@ -239,40 +533,65 @@ def get_dryad_dataset(doi_identifier: str, token: str):
             logging.error(f"Status code: {response.status_code}")
             logging.error(f"Response content: {response.text}")
 
-def get_dryad_dataset_file(file_url: str, local_file_path: str, token: str):
+def get_dryad_dataset_file(file_url: str, local_file_path: str, token_manager: TokenManager) -> bool:
     """
     Downloads individual file from a dataset using the specifc file URL
 
     Args:
         file_url: the specific URL to download a file
         local_file_path: the directory to store the file on local machine
-        token: the Bearer token for authentication
+        token_manager: provides the Bearer token for authentication
+
+    Returns:
+        True if the file was downloaded, False otherwise
     """
+    token = token_manager.get()
+    if not token:
+        tqdm.write("Error: no valid authentication token")
+        logging.error(f"No valid authentication token, skipping {local_file_path}")
+        return False
     API_URL = f"https://datadryad.org{file_url}/download"
     headers = {
         "Authorization": f"Bearer {token}",
-        "Accept": "*/*"
+        "Accept": "*/*",
+        # Binary payloads gain nothing from transfer compression, and it would break content-length progress
+        "Accept-Encoding": "identity"
     }
+    file_name = os.path.basename(local_file_path)
     response = None
     try:
-        response = requests.get(API_URL, headers=headers, stream=True)
+        response = SESSION.get(API_URL, headers=headers, stream=True)
         response.raise_for_status()
         
         total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
+        # Listing paths may include subdirectories
+        os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
         
         with open(local_file_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total_size > 0:
-                        percentage = (downloaded / total_size) * 100
-                        print(f"  Progress: {percentage:.1f}%", end='\r')
-        print(f"Downloaded: {os.path.basename(local_file_path)}")
-    except requests.exceptions.RequestException as e:
-        print(f"Error downloading file: {e}")
+            # Reserve the whole file up front so the filesystem can allocate contiguous extents
+            if total_size > 0 and hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(f.fileno(), 0, total_size)
+                except OSError as e:
+                    logging.info(f"Preallocation not supported for {local_file_path}: {e}")
+            try:
+                # Read straight from the urllib3 stream in large blocks, bypassing the iter_content generator;
+                # tqdm only sees each write and rate-limits its own redraws. Bars are cleared when done
+                # so the concurrent downloads don't pile finished bars over the active ones
+                with tqdm.wrapattr(f, "write", total=total_size or None, desc=file_name, leave=False) as writer:
+                    response.raw.decode_content = True
+                    shutil.copyfileobj(response.raw, writer, DOWNLOAD_CHUNK_SIZE)
+            finally:
+                # Drop any preallocated tail left behind by an interrupted download
+                f.truncate()
+        # tqdm.write prints above the active bars instead of into them
+        tqdm.write(f"Downloaded: {file_name}")
+        return True
+    # Reading response.raw directly surfaces urllib3 errors that iter_content used to wrap
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+        tqdm.write(f"Error downloading file: {e}")
         logging.error(f"Error downloading file: {e}")
+        return False
 
 def main(args: list[str] = None):
     global PARENT_DIRECTORY
@@ -284,19 +603,22 @@ def main(args: list[str] = None):
     CLIENT_ID = os.getenv("CLIENT_ID", "")
     CLIENT_SECRET = os.getenv("CLIENT_SECRET", "")
     PARENT_DIRECTORY = os.getenv("PARENT_DIRECTORY", "")
-    token = get_dryad_token()
-    if not token:
-        logging.error("Failed to obtain authentication token")
-        return 
-    dois = args if args else sys.argv[1:]  
-    if not dois:
-        print("You need to include at least one DOI of Dryad")
-        logging.error("No DOI provided")
-        return   
-    for doi in dois:
-        print(f"\nDownloading dataset for DOI: {doi}")
-        logging.info(f"Downloading dataset for DOI: {doi}")
-        get_dryad_dataset(doi, token)
+    try:
+        token_manager = TokenManager(CLIENT_ID, CLIENT_SECRET)
+        if not token_manager.get():
+            logging.error("Failed to obtain authentication token")
+            return 
+        dois = args if args else sys.argv[1:]  
+        if not dois:
+            print("You need to include at least one DOI of Dryad")
+            logging.error("No DOI provided")
+            return   
+        # One download pool shared by every dataset, so concurrent requests never exceed the connection pool
+        with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as download_executor, \
+                ThreadPoolExecutor(max_workers=min(MAX_DATASET_WORKERS, len(dois))) as executor:
+            list(executor.map(lambda doi: get_dryad_dataset(doi, token_manager, download_executor), dois))
+    finally:
+        SESSION.close()
 
 if __name__ == "__main__":
     main()